@@ -1,9 +1,29 @@
 import sys
 import argparse
-from noize import __version__
+from noize import __version__, util
 from noize.cmd import CMD_EXP, CMD_PER, CMD_UNF, CMD_SP, CMD_RAY, CMD_GSS, CMD_ER, apply_cmd
 
 
+def add_output_arguments(subparser: argparse.ArgumentParser) -> None:
+    subparser.add_argument(
+        "--compress-level", type=int, default=None, choices=range(10), metavar="[0-9]",
+        help="PNG zlib compression level, 0 is no compression. Default Pillow default."
+    )
+    subparser.add_argument(
+        "--quality", type=int, default=None, choices=range(101), metavar="[0-100]",
+        help="WebP and JPEG quality. Default Pillow default."
+    )
+    subparser.add_argument(
+        "--stack", action="store_true",
+        help="Write all outputs into one preallocated '.npy' stack given by --output."
+    )
+    subparser.add_argument(
+        "--stats", type=str, default=None, metavar="<file>",
+        help="Write MSE, PSNR and noise histogram of the outputs as JSON to the file,"
+             " '-' writes to stdout."
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Apply noise to images."
@@ -17,12 +37,13 @@ def main() -> None:
     # periodic
     subparser = subparsers.add_parser(CMD_PER, help="Apply periodic noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-m", "--mode", type=str, default="gray",
@@ -37,17 +58,19 @@ def main() -> None:
         "-w", "--wavelength", type=float, default=100.0,
         help="Length of the wave. Default 100.0"
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_PER)
 
     # salt and pepper
     subparser = subparsers.add_parser(CMD_SP, help="Apply salt and pepper noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-p", "--probability", type=float, default=0.1,
@@ -57,17 +80,19 @@ def main() -> None:
         "--seed", type=int, default=None,
         help="Seed value, default None."
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_SP)
 
     # gaussian
     subparser = subparsers.add_parser(CMD_GSS, help="Apply gaussian noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-m", "--mean", type=float, default=0.0,
@@ -81,17 +106,19 @@ def main() -> None:
         "--seed", type=int, default=None,
         help="Seed value, default None."
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_GSS)
 
     # rayleigh
     subparser = subparsers.add_parser(CMD_RAY, help="Apply rayleigh noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-l", "--loc", type=float, default=0.0,
@@ -105,17 +132,19 @@ def main() -> None:
         "--seed", type=int, default=None,
         help="Seed value, default None."
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_RAY)
 
     # erlang
     subparser = subparsers.add_parser(CMD_ER, help="Apply erlang (gamma) noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-a", type=int, default=1,
@@ -133,17 +162,19 @@ def main() -> None:
         "--seed", type=int, default=None,
         help="Seed value, default None."
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_ER)
 
     # exponential
     subparser = subparsers.add_parser(CMD_EXP, help="Apply exponential noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-l", "--loc", type=float, default=0.0,
@@ -157,17 +188,19 @@ def main() -> None:
         "--seed", type=int, default=None,
         help="Seed value, default None."
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_EXP)
 
     # uniform
     subparser = subparsers.add_parser(CMD_UNF, help="Apply uniform noise.")
     subparser.add_argument(
-        "img", type=str,
-        metavar="<file>", help="Source image file."
+        "img", type=str, nargs="+",
+        metavar="<file>", help="Source image file(s)."
     )
     subparser.add_argument(
         "-o", "--output", type=str, default="output.png",
-        metavar="<file>", help="Output file."
+        metavar="<file>", help="Output file. The format is chosen by the extension, '.npy'"
+             " writes raw arrays. Multiple images are numbered, e.g. output_0.png."
     )
     subparser.add_argument(
         "-l", "--loc", type=float, default=0.0,
@@ -181,6 +214,7 @@ def main() -> None:
         "--seed", type=int, default=None,
         help="Seed value, default None."
     )
+    add_output_arguments(subparser)
     subparser.set_defaults(command=CMD_UNF)
 
     args = parser.parse_args()
@@ -188,7 +222,12 @@ def main() -> None:
         sys.exit("Unknown command.")
     if "img" not in args:
         sys.exit("Input image not given.")
-    apply_cmd(args)
+    if args.stack and not args.output.lower().endswith(".npy"):
+        sys.exit("Output should be a '.npy' file with --stack.")
+    try:
+        apply_cmd(args)
+    except (util.BadShapeException, util.BadModeException) as e:
+        sys.exit(str(e))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
+import os
 import argparse
 import numpy as np
 from PIL import Image
+from typing import Iterable, Iterator, List, Tuple, Union
+from noize import util
+from noize.parallel import sample_seeds
+from noize.stats import NoiseStats
 from noize.noise import exponential, salt_and_pepper, rayleigh, gaussian, erlang, periodic
 
 
@@ -13,23 +18,115 @@ CMD_EXP = "exponential"
 CMD_UNF = "uniform"
 
 
-def apply_cmd(args: argparse.Namespace) -> None:
-    img = Image.open(args.img)
-
+def apply_noise(args: argparse.Namespace, im_arr: np.ndarray, seed: int=None,
+                return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     if args.command == CMD_PER:
-        noisy_im = periodic(np.array(img), args.mode, args.angle, args.wavelength)
+        noisy_im = periodic(im_arr, args.mode, args.angle, args.wavelength, return_stats)
     elif args.command == CMD_SP:
-        noisy_im = salt_and_pepper(np.array(img), args.probability, args.seed)
+        noisy_im = salt_and_pepper(im_arr, args.probability, seed, return_stats)
     elif args.command == CMD_GSS:
-        noisy_im = gaussian(np.array(img), args.mean, args.var, args.seed)
+        noisy_im = gaussian(im_arr, args.mean, args.var, seed, return_stats)
     elif args.command == CMD_RAY:
-        noisy_im = rayleigh(np.array(img), args.loc, args.scale, args.seed)
+        noisy_im = rayleigh(im_arr, args.loc, args.scale, seed, return_stats)
     elif args.command == CMD_ER:
-        noisy_im = erlang(np.array(img), args.a, args.loc, args.scale, args.seed)
+        noisy_im = erlang(im_arr, args.a, args.loc, args.scale, seed, return_stats)
     elif args.command == CMD_EXP:
-        noisy_im = exponential(np.array(img), args.loc, args.scale, args.seed)
+        noisy_im = exponential(im_arr, args.loc, args.scale, seed, return_stats)
     elif args.command == CMD_UNF:
-        noisy_im = exponential(np.array(img), args.loc, args.scale, args.seed)
+        noisy_im = exponential(im_arr, args.loc, args.scale, seed, return_stats)
+    return noisy_im
+
+
+def output_path(output: str, index: int, count: int) -> str:
+    """Output file of the image at index, numbered if there are multiple images."""
+    if count == 1:
+        return output
+    root, ext = os.path.splitext(output)
+    return "{}_{}{}".format(root, index, ext)
+
+
+def save_output(im_arr: np.ndarray, output: str, compress_level: int=None,
+                quality: int=None) -> None:
+    """Save the image array to output, the format is chosen by the file extension.
+
+    ".npy" files are written as raw arrays. TIFF files are written uncompressed.
+    compress_level is used for PNG and quality for WebP and JPEG files.
+    """
+    ext = os.path.splitext(output)[1].lower()
+    if ext == ".npy":
+        np.save(output, im_arr)
+        return
+
+    params = {}
+    if ext == ".png" and compress_level is not None:
+        params["compress_level"] = compress_level
+    elif ext in (".tif", ".tiff"):
+        params["compression"] = "raw"
+    elif ext in (".webp", ".jpg", ".jpeg") and quality is not None:
+        params["quality"] = quality
+    Image.fromarray(im_arr).save(output, **params)
+
+
+def save_stack(im_arrs: Iterable[np.ndarray], count: int, output: str) -> None:
+    """Write images into one preallocated memory-mapped .npy stack of count images.
+
+    The stack file is removed if an image can not be written, e.g. its shape differs.
+    """
+    stack = None
+    try:
+        for i, im_arr in enumerate(im_arrs):
+            if stack is None:
+                stack = np.lib.format.open_memmap(
+                    output, mode="w+", dtype=im_arr.dtype, shape=(count,) + im_arr.shape
+                )
+            elif im_arr.shape != stack.shape[1:]:
+                raise util.BadShapeException(
+                    "Image shape {} does not match the stack {}.".format(im_arr.shape,
+                                                                       stack.shape[1:])
+                )
+            stack[i] = im_arr
+        if stack is not None:
+            stack.flush()
+    except BaseException:
+        if stack is not None:
+            stack = None
+            os.remove(output)
+        raise
+
+
+def noisy_images(args: argparse.Namespace, seeds: List[int],
+                 noise_stats: NoiseStats=None) -> Iterator[np.ndarray]:
+    """Apply noise to the images one by one, accumulating their stats into noise_stats."""
+    for img, seed in zip(args.img, seeds):
+        noisy_im = apply_noise(args, np.array(Image.open(img)), seed, noise_stats is not None)
+        if noise_stats is not None:
+            noisy_im, im_stats = noisy_im
+            noise_stats.merge(im_stats)
+        yield noisy_im
+
+
+def save_stats(noise_stats: NoiseStats, output: str) -> None:
+    """Write the stats as JSON to output, or to stdout if output is "-"."""
+    if output == "-":
+        print(noise_stats.to_json())
+        return
+    with open(output, "w") as f:
+        f.write(noise_stats.to_json())
+
+
+def apply_cmd(args: argparse.Namespace) -> None:
+    count = len(args.img)
+    seed = getattr(args, "seed", None)
+    # each image of a batch gets its own seed, otherwise all would get the same noise
+    seeds = sample_seeds(seed, count) if seed is not None and count > 1 else [seed]*count
+    noise_stats = NoiseStats() if args.stats is not None else None
+    noisy_ims = noisy_images(args, seeds, noise_stats)
 
-    noisy_im = Image.fromarray(noisy_im)
-    noisy_im.save(args.output)
+    if args.stack:
+        save_stack(noisy_ims, count, args.output)
+    else:
+        for i, noisy_im in enumerate(noisy_ims):
+            save_output(noisy_im, output_path(args.output, i, count),
+                        args.compress_level, args.quality)
+    if noise_stats is not None:
+        save_stats(noise_stats, args.stats)
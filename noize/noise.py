@@ -1,7 +1,8 @@
 import numpy as np
 from scipy import stats
 from noize import util
-from typing import Callable
+from noize.stats import NoiseStats
+from typing import Callable, Tuple, Union
 
 
 def __periodic_noise(im: np.ndarray, angle: int, wavelength: int) -> np.ndarray:
@@ -16,7 +17,8 @@ def __periodic_noise(im: np.ndarray, angle: int, wavelength: int) -> np.ndarray:
     return noise_im
 
 
-def periodic(image: np.ndarray, mode: str="gray", angle: int=0, wavelength: int=100) -> np.ndarray:
+def periodic(image: np.ndarray, mode: str="gray", angle: int=0, wavelength: int=100,
+             return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Applies periodic noise to given image.
 
     Parameters
@@ -32,6 +34,9 @@ def periodic(image: np.ndarray, mode: str="gray", angle: int=0, wavelength: int=
         The angle of the periodic noise. (Default 0).
     wavelength : int, optional
         The wavelength of the periodic (sinusoidal) noise. (Default 100).
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -45,6 +50,9 @@ def periodic(image: np.ndarray, mode: str="gray", angle: int=0, wavelength: int=
     np.ndarray
         The noise applied image. It will be in same shape with the input image unless the mode
         is "gray" and the given image is RGB.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given.
     """
     util.check_input(image, accepted_shapes=("gray", "RGB"))
     im_arr = image/255.0
@@ -52,7 +60,7 @@ def periodic(image: np.ndarray, mode: str="gray", angle: int=0, wavelength: int=
         if len(im_arr.shape) == 3:
             im_arr = np.average(im_arr, weights=[0.299, 0.587, 0.114], axis=2)
         noise_im = __periodic_noise(im_arr, angle, wavelength)
-        return (noise_im*255).astype(np.uint8)
+        return __output(im_arr*255, (noise_im*255).astype(np.uint8), return_stats)
 
     util.check_input(image, accepted_shapes=("RGB"))
     if mode == "R":
@@ -70,10 +78,11 @@ def periodic(image: np.ndarray, mode: str="gray", angle: int=0, wavelength: int=
             noise_im[:, :, i] = __periodic_noise(noise_im[:, :, i], angle, wavelength)
     else:
         raise util.BadModeException("Bad mode {}.".format(mode))
-    return (noise_im*255).astype(np.uint8)
+    return __output(image, (noise_im*255).astype(np.uint8), return_stats)
 
 
-def salt_and_pepper(image: np.ndarray, prob: float=0.1, seed: int=None) -> np.ndarray:
+def salt_and_pepper(image: np.ndarray, prob: float=0.1, seed: int=None, return_stats: bool=False
+                    ) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply salt and pepper noise to given grayscale or rgb image with given prob.
 
     Parameters
@@ -85,6 +94,9 @@ def salt_and_pepper(image: np.ndarray, prob: float=0.1, seed: int=None) -> np.nd
         The probablity that sp noise to apply. Default 0.1
     seed : int, optional
         Seed to be used while adding noise randomly. Default None.
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -95,15 +107,24 @@ def salt_and_pepper(image: np.ndarray, prob: float=0.1, seed: int=None) -> np.nd
     -------
     np.ndarray
         The noise applied image. It will be in same shape with the input image.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given. It also holds the fraction of pixel values hit by the noise.
     """
     util.check_input(image)
     output = image.copy()
     rng = np.random.default_rng(seed)
+    corrupted = 0
 
     def sp(im, prob, rng):
+        nonlocal corrupted
         probs = rng.random(im.shape[:2])
-        im[probs < (prob / 2)] = 0
-        im[probs > 1 - (prob / 2)] = 255
+        pepper = probs < (prob / 2)
+        salt = probs > 1 - (prob / 2)
+        im[pepper] = 0
+        im[salt] = 255
+        if return_stats:
+            corrupted += int(np.count_nonzero(pepper | salt))
         return im
 
     if len(image.shape) == 2:
@@ -111,10 +132,11 @@ def salt_and_pepper(image: np.ndarray, prob: float=0.1, seed: int=None) -> np.nd
     elif len(image.shape) == 3:
         for i in range(image.shape[2]):
             output[:, :, i] = sp(output[:, :, i], prob, rng)
-    return output.astype(np.uint8)
+    return __output(image, output.astype(np.uint8), return_stats, corrupted)
 
 
-def gaussian(image: np.ndarray, mean: float=0.0, var: float=0.01, seed: int=None) -> np.ndarray:
+def gaussian(image: np.ndarray, mean: float=0.0, var: float=0.01, seed: int=None,
+             return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply gaussian noise to given grayscale or rgb image.
 
     For the gaussian random generator numpy.random.random function used.
@@ -129,6 +151,9 @@ def gaussian(image: np.ndarray, mean: float=0.0, var: float=0.01, seed: int=None
         The variance of the distribution. Default 0.01
     seed : int, optional
         Seed to be used while adding noise randomly. Default None.
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -139,12 +164,17 @@ def gaussian(image: np.ndarray, mean: float=0.0, var: float=0.01, seed: int=None
     -------
     np.ndarray
         The noise applied image. It will be in same shape with the input image.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given.
     """
     rng = np.random.default_rng(seed)
-    return __noise_with_pdf(image, rng.normal, loc=mean, scale=var**0.5)
+    return __noise_with_pdf(image, rng.normal, return_stats, loc=mean,
+                            scale=var**0.5)
 
 
-def rayleigh(image: np.ndarray, loc: float=0.0, scale: float=0.1, seed: int=None) -> np.ndarray:
+def rayleigh(image: np.ndarray, loc: float=0.0, scale: float=0.1, seed: int=None,
+             return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply rayleigh noise to given grayscale or rgb image.
 
     Check scipy.stats.rayleigh for more information.
@@ -159,6 +189,9 @@ def rayleigh(image: np.ndarray, loc: float=0.0, scale: float=0.1, seed: int=None
         Scale of the distribution. Default 0.1
     seed : int, optional
         Seed to be used while adding noise randomly. Default None.
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -169,11 +202,16 @@ def rayleigh(image: np.ndarray, loc: float=0.0, scale: float=0.1, seed: int=None
     -------
     np.ndarray
         The noise applied image. It will be in same shape with the input image.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given.
     """
-    return __noise_with_pdf(image, stats.rayleigh.rvs, loc=loc, scale=scale, random_state=seed)
+    return __noise_with_pdf(image, stats.rayleigh.rvs, return_stats,
+                            loc=loc, scale=scale, random_state=seed)
 
 
-def erlang(image: np.ndarray, a: int, loc: float, scale: float, seed: int=None) -> np.ndarray:
+def erlang(image: np.ndarray, a: int, loc: float, scale: float, seed: int=None,
+           return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply erlang (gamma) noise to given grayscale or rgb image.
 
     Check scipy.stats.gamma for more information.
@@ -188,6 +226,9 @@ def erlang(image: np.ndarray, a: int, loc: float, scale: float, seed: int=None)
         Scale of the distribution. Default 0.1
     seed : int, optional
         Seed to be used while adding noise randomly. Default None.
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -198,11 +239,16 @@ def erlang(image: np.ndarray, a: int, loc: float, scale: float, seed: int=None)
     -------
     np.ndarray
         The noise applied image. It will be in same shape with the input image.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given.
     """
-    return __noise_with_pdf(image, stats.gamma.rvs, a=a, loc=loc, scale=scale, random_state=seed)
+    return __noise_with_pdf(image, stats.gamma.rvs, return_stats,
+                            a=a, loc=loc, scale=scale, random_state=seed)
 
 
-def exponential(image: np.ndarray, loc: float, scale: float, seed: int=None) -> np.ndarray:
+def exponential(image: np.ndarray, loc: float, scale: float, seed: int=None,
+                return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply exponential noise to given grayscale or rgb image.
 
     Check scipy.stats.expon for more information.
@@ -217,6 +263,9 @@ def exponential(image: np.ndarray, loc: float, scale: float, seed: int=None) ->
         Scale of the distribution. Default 0.1
     seed : int, optional
         Seed to be used while adding noise randomly. Default None.
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -227,11 +276,16 @@ def exponential(image: np.ndarray, loc: float, scale: float, seed: int=None) ->
     -------
     np.ndarray
         The noise applied image. It will be in same shape with the input image.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given.
     """
-    return __noise_with_pdf(image, stats.expon.rvs, loc=loc, scale=scale, random_state=seed)
+    return __noise_with_pdf(image, stats.expon.rvs, return_stats,
+                            loc=loc, scale=scale, random_state=seed)
 
 
-def uniform(image: np.ndarray, loc: float, scale: float, seed: int=None) -> np.ndarray:
+def uniform(image: np.ndarray, loc: float, scale: float, seed: int=None,
+            return_stats: bool=False) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply uniform noise to given grayscale or rgb image.
 
     Check scipy.stats.uniform for more information.
@@ -246,6 +300,9 @@ def uniform(image: np.ndarray, loc: float, scale: float, seed: int=None) -> np.n
         Scale of the distribution. Default 0.1
     seed : int, optional
         Seed to be used while adding noise randomly. Default None.
+    return_stats : bool, optional
+        Also return the quality metrics of the noise, computed from the images in memory.
+        Default False.
 
     Raises
     ------
@@ -256,15 +313,30 @@ def uniform(image: np.ndarray, loc: float, scale: float, seed: int=None) -> np.n
     -------
     np.ndarray
         The noise applied image. It will be in same shape with the input image.
+    noize.stats.NoiseStats
+        The MSE, PSNR and noise histogram of the noise applied image, only returned if
+        return_stats is given.
     """
-    return __noise_with_pdf(image, stats.uniform.rvs, loc=loc, scale=scale, random_state=seed)
+    return __noise_with_pdf(image, stats.uniform.rvs, return_stats,
+                            loc=loc, scale=scale, random_state=seed)
 
 
-def __noise_with_pdf(im_arr: np.ndarray, pdf: Callable, **kwargs) -> np.ndarray:
+def __noise_with_pdf(image: np.ndarray, pdf: Callable, return_stats: bool=False,
+                     **kwargs) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
     """Apply noise to given image array using pdf function that generates random values."""
-    util.check_input(im_arr)
-    im_arr = im_arr/255.0
+    util.check_input(image)
+    im_arr = image/255.0
     noise = pdf(**kwargs, size=im_arr.shape)
     out_im = im_arr + noise
     out_im = np.clip(out_im, 0.0, 1.0)
-    return (out_im*255.0).astype(np.uint8)
+    return __output(image, (out_im*255.0).astype(np.uint8), return_stats)
+
+
+def __output(clean: np.ndarray, noisy: np.ndarray, return_stats: bool,
+             corrupted: int=None) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
+    """Return the noisy image, with the stats of the clean and noisy pair if requested."""
+    if not return_stats:
+        return noisy
+    noise_stats = NoiseStats()
+    noise_stats.update(clean, noisy, corrupted)
+    return noisy, noise_stats
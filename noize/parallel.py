@@ -0,0 +1,185 @@
+import os
+import inspect
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from noize.stats import NoiseStats
+from typing import Callable, List, Sequence, Tuple, Union
+
+
+def _init_worker() -> None:
+    """Import the noise modules once so the tasks do not pay for it."""
+    from noize import noise  # noqa: F401
+
+
+def _run(func: Callable, kwargs: dict, src: Tuple, dst: Tuple,
+         start: int, stop: int, seeds: List[int]) -> NoiseStats:
+    """Apply func to the samples in [start, stop) of src and write them to dst.
+
+    Returns the merged stats of the samples if return_stats is given. The segments are closed
+    when the task ends, so idle workers do not keep batches mapped.
+    """
+    src_name, src_shape, src_dtype = src
+    dst_name, dst_shape, dst_dtype = dst
+    src_shm = dst_shm = src_arr = dst_arr = None
+    try:
+        src_shm = shared_memory.SharedMemory(name=src_name)
+        dst_shm = shared_memory.SharedMemory(name=dst_name)
+        src_arr = np.ndarray(src_shape, dtype=src_dtype, buffer=src_shm.buf)
+        dst_arr = np.ndarray(dst_shape, dtype=dst_dtype, buffer=dst_shm.buf)
+        chunk_stats = NoiseStats() if kwargs.get("return_stats") else None
+        for i in range(start, stop):
+            if seeds is not None:
+                kwargs["seed"] = seeds[i - start]
+            noisy_im = func(src_arr[i], **kwargs)
+            if chunk_stats is not None:
+                noisy_im, im_stats = noisy_im
+                chunk_stats.merge(im_stats)
+            dst_arr[i] = noisy_im
+        return chunk_stats
+    finally:
+        src_arr = dst_arr = None
+        for shm in (src_shm, dst_shm):
+            if shm is not None:
+                shm.close()
+
+
+def sample_seeds(seed: int, n: int) -> List[int]:
+    """Derive n independent sample seeds from the given seed.
+
+    The seeds depend only on the seed and the sample index, so a sample gets the same noise
+    regardless of the number of workers or the chunk size.
+    """
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+class Pool:
+    """Process pool that applies noise to image batches through shared memory.
+
+    The input and output batches are placed in shared memory segments, only the noise
+    function, its parameters and the sample offsets are sent to the workers. The workers are
+    spawned, so they do not inherit the segments mapped by the parent process, and scripts
+    using the pool should be guarded with `if __name__ == "__main__":`.
+
+    Parameters
+    ----------
+    processes : int, optional
+        Number of worker processes. Default None, which uses the number of CPUs.
+    chunksize : int, optional
+        Number of samples sent to a worker in one task. Default None, which splits the batch
+        evenly between the workers.
+    """
+
+    def __init__(self, processes: int=None, chunksize: int=None):
+        self.processes = processes
+        self.chunksize = chunksize
+        self._executor = None
+
+    def __enter__(self) -> "Pool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.processes, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def map(self, func: Callable, images: Union[np.ndarray, Sequence[np.ndarray]],
+            seed: int=None, **kwargs) -> Union[np.ndarray, Tuple[np.ndarray, NoiseStats]]:
+        """Apply the noise function to every image of the batch.
+
+        Parameters
+        ----------
+        func : Callable
+            A noise function from noize.noise, e.g. noize.noise.gaussian.
+        images : np.ndarray or Sequence[np.ndarray]
+            The batch of images. All images should have the same shape and dtype.
+        seed : int, optional
+            Seed of the batch. Each sample gets its own seed derived from it, so the output is
+            deterministic per sample. Ignored if func does not take a seed. Default None.
+        **kwargs
+            Other parameters of the noise function. If return_stats is given, the stats of the
+            samples are merged and returned with the batch.
+
+        Raises
+        ------
+        concurrent.futures.process.BrokenProcessPool
+            If a worker process terminated abruptly. The pool is restarted on the next call.
+
+        Returns
+        -------
+        np.ndarray
+            The batch of noise applied images.
+        noize.stats.NoiseStats
+            The merged stats of the batch, only returned if return_stats is given.
+        """
+        images = np.asarray(images)
+        n = len(images)
+        seeds = None
+        if "seed" in inspect.signature(func).parameters:
+            seeds = sample_seeds(seed, n) if seed is not None else [None]*n
+        batch_stats = NoiseStats() if kwargs.get("return_stats") else None
+        if n == 0:
+            return (images.copy(), batch_stats) if batch_stats is not None else images.copy()
+
+        # the first sample defines the output shape and dtype
+        first = func(images[0], **kwargs, **({"seed": seeds[0]} if seeds else {}))
+        if batch_stats is not None:
+            first, first_stats = first
+            batch_stats.merge(first_stats)
+        out_shape = (n,) + first.shape
+        src_shm = dst_shm = src = dst = None
+        futures = []
+        try:
+            src_shm = shared_memory.SharedMemory(create=True, size=max(images.nbytes, 1))
+            dst_shm = shared_memory.SharedMemory(create=True, size=max(first.nbytes*n, 1))
+            src = np.ndarray(images.shape, dtype=images.dtype, buffer=src_shm.buf)
+            src[:] = images
+            dst = np.ndarray(out_shape, dtype=first.dtype, buffer=dst_shm.buf)
+            dst[0] = first
+
+            src_info = (src_shm.name, images.shape, images.dtype.str)
+            dst_info = (dst_shm.name, out_shape, first.dtype.str)
+            executor = self._get_executor()
+            workers = self.processes or os.cpu_count() or 1
+            chunksize = self.chunksize or max(1, -(-(n - 1) // workers))
+            for start in range(1, n, chunksize):
+                stop = min(start + chunksize, n)
+                futures.append(executor.submit(
+                    _run, func, kwargs, src_info, dst_info, start, stop,
+                    seeds[start:stop] if seeds else None
+                ))
+            try:
+                for future in futures:
+                    chunk_stats = future.result()
+                    if batch_stats is not None:
+                        batch_stats.merge(chunk_stats)
+            except BrokenProcessPool:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                raise
+            output = dst.copy()
+        finally:
+            # do not release the segments while running tasks still write to them
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            src = dst = None
+            for shm in (src_shm, dst_shm):
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+        return (output, batch_stats) if batch_stats is not None else output
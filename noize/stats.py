@@ -0,0 +1,86 @@
+import json
+import numpy as np
+
+
+HIST_MIN = -255
+HIST_BINS = 511
+# squares of the histogram bin values, the squared error is computed from the histogram
+_SQUARES = np.arange(HIST_MIN, HIST_MIN + HIST_BINS, dtype=np.int64)**2
+
+
+class NoiseStats:
+    """Streaming quality metrics of noise applied images.
+
+    The metrics are accumulated from the clean and noisy images in memory right after the noise
+    is applied, so the images are not reloaded, and can be merged across images and batches.
+    """
+
+    def __init__(self):
+        self.images = 0
+        self.pixels = 0
+        self.sq_error = 0
+        self.corrupted = None
+        self.histogram = np.zeros(HIST_BINS, dtype=np.int64)
+
+    def update(self, clean: np.ndarray, noisy: np.ndarray, corrupted: int=None) -> None:
+        """Accumulate the metrics of a clean and noisy image pair of the same shape.
+
+        The noise is computed once as int16 and clipped to [-255, 255], the squared error is
+        taken from its histogram to avoid full size float copies. corrupted is the number of
+        pixel values hit by the noise, if it is known.
+        """
+        noise = np.subtract(noisy, clean, dtype=np.int16, casting="unsafe")
+        np.clip(noise, HIST_MIN, HIST_MIN + HIST_BINS - 1, out=noise)
+        noise -= HIST_MIN
+        counts = np.bincount(noise.ravel(), minlength=HIST_BINS)
+        self.images += 1
+        self.pixels += noise.size
+        self.histogram += counts
+        self.sq_error += int(counts @ _SQUARES)
+        if corrupted is not None:
+            self.corrupted = (self.corrupted or 0) + corrupted
+
+    def merge(self, other: "NoiseStats") -> "NoiseStats":
+        """Add the metrics of other to these metrics."""
+        self.images += other.images
+        self.pixels += other.pixels
+        self.sq_error += other.sq_error
+        self.histogram += other.histogram
+        if other.corrupted is not None:
+            self.corrupted = (self.corrupted or 0) + other.corrupted
+        return self
+
+    @property
+    def mse(self) -> float:
+        return self.sq_error / self.pixels if self.pixels else 0.0
+
+    @property
+    def psnr(self) -> float:
+        """Peak signal to noise ratio in dB for 8 bit images."""
+        mse = self.mse
+        return 10*np.log10(255.0**2/mse) if mse > 0 else float("inf")
+
+    @property
+    def corrupted_fraction(self) -> float:
+        """Fraction of the pixel values hit by the noise, None if it is not known.
+
+        Values that already had the noise value, e.g. pepper on a black pixel, are counted too.
+        The fraction of values changed by the noise is given by the histogram.
+        """
+        if self.corrupted is None or not self.pixels:
+            return None
+        return self.corrupted / self.pixels
+
+    def to_dict(self) -> dict:
+        psnr = self.psnr
+        return {
+            "images": self.images,
+            "pixels": self.pixels,
+            "mse": self.mse,
+            "psnr": psnr if np.isfinite(psnr) else None,
+            "corrupted_fraction": self.corrupted_fraction,
+            "histogram": {"min": HIST_MIN, "counts": self.histogram.tolist()},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
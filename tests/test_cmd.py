@@ -0,0 +1,101 @@
+import json
+import sys
+import pytest
+import numpy as np
+from PIL import Image
+from numpy.testing import assert_array_equal
+from noize import util
+from noize import cmd
+from noize.__main__ import main
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["noize"] + [str(a) for a in argv])
+    main()
+
+
+@pytest.fixture
+def images(tmp_path):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(3):
+        path = tmp_path / "im{}.png".format(i)
+        Image.fromarray(rng.integers(0, 256, (16, 16, 3), dtype=np.uint8)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_save_npy(tmp_path):
+    im = np.arange(16*16, dtype=np.uint16).reshape(16, 16)
+    output = str(tmp_path / "out.npy")
+    cmd.save_output(im, output)
+    assert_array_equal(np.load(output), im)
+
+
+def test_save_encoder_settings(tmp_path):
+    im = np.zeros((16, 16, 3), dtype=np.uint8)
+    for name in ("out.png", "out.tiff", "out.webp"):
+        output = str(tmp_path / name)
+        cmd.save_output(im, output, compress_level=0, quality=100)
+        assert np.array(Image.open(output)).shape == im.shape
+
+
+def test_save_stack_shape(tmp_path):
+    ims = [np.zeros((16, 16)), np.zeros((8, 8))]
+    output = tmp_path / "out.npy"
+    with pytest.raises(util.BadShapeException):
+        cmd.save_stack(ims, len(ims), str(output))
+    assert not output.exists()
+
+
+def test_cli_stack_mixed_shapes(monkeypatch, tmp_path, images):
+    gray = tmp_path / "gray.png"
+    Image.fromarray(np.zeros((16, 16), dtype=np.uint8)).save(gray)
+    output = tmp_path / "out.npy"
+    with pytest.raises(SystemExit) as e:
+        _run(monkeypatch, "gaussian", images[0], gray, "--stack", "-o", output)
+    assert "does not match the stack" in str(e.value.code)
+    assert not output.exists()
+
+
+def test_cli_stack(monkeypatch, tmp_path, images):
+    output = tmp_path / "out.npy"
+    _run(monkeypatch, "gaussian", *images, "--seed", 25, "--stack", "-o", output)
+    stack = np.load(output)
+    assert stack.shape == (3, 16, 16, 3)
+    assert not np.array_equal(stack[0] - np.array(Image.open(images[0])),
+                              stack[1] - np.array(Image.open(images[1])))
+
+
+def test_cli_multiple_outputs(monkeypatch, tmp_path, images):
+    output = tmp_path / "out.png"
+    _run(monkeypatch, "salt-and-pepper", *images, "--compress-level", 1, "-o", output)
+    for i in range(len(images)):
+        assert (tmp_path / "out_{}.png".format(i)).exists()
+
+
+def test_cli_bad_quality(monkeypatch, tmp_path, images):
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, "gaussian", images[0], "--quality", 500, "-o", tmp_path / "q.webp")
+    assert not (tmp_path / "q.webp").exists()
+
+
+def test_cli_stack_bad_output(monkeypatch, tmp_path, images):
+    with pytest.raises(SystemExit):
+        _run(monkeypatch, "gaussian", *images, "--stack", "-o", tmp_path / "out.png")
+
+
+def test_cli_stats(monkeypatch, tmp_path, images):
+    output = tmp_path / "stats.json"
+    _run(monkeypatch, "salt-and-pepper", *images, "-p", 0.2, "--stats", output,
+         "-o", tmp_path / "out.npy")
+    res = json.loads(output.read_text())
+    assert res["images"] == len(images)
+    assert abs(res["corrupted_fraction"] - 0.2) < 0.1
+    assert sum(res["histogram"]["counts"]) == res["pixels"]
+
+
+def test_cli_stats_stdout(monkeypatch, capsys, tmp_path, images):
+    _run(monkeypatch, "gaussian", "--stats", "-", *images, "-o", tmp_path / "out.npy")
+    res = json.loads(capsys.readouterr().out)
+    assert res["images"] == len(images)
@@ -150,3 +150,34 @@ def test_overflow_pdf():
     res = noise.__noise_with_pdf(im, pdf, loc=loc, scale=scale)
     assert res.max() <= 255
     assert res.min() >= 0
+
+
+def test_return_stats():
+    seed = 25
+    im_shape = (64, 64, 3)
+    im = np.full(im_shape, 128, dtype=np.uint8)
+    nz, nz_stats = noise.gaussian(im, 0.0, 0.01, seed, return_stats=True)
+    assert_array_equal(nz, noise.gaussian(im, 0.0, 0.01, seed))
+    diff = nz.astype(np.float64) - im
+    assert np.isclose(nz_stats.mse, np.mean(diff**2))
+    assert np.isclose(nz_stats.psnr, 10*np.log10(255.0**2/np.mean(diff**2)))
+    assert nz_stats.histogram.sum() == im.size
+    assert nz_stats.corrupted_fraction is None
+
+    nz, nz_stats = noise.periodic(im, "gray", return_stats=True)
+    assert nz_stats.pixels == nz.size
+
+
+def test_return_stats_sp():
+    seed = 25
+    prob = 0.5
+    im = np.full((128, 128), 128, dtype=np.uint8)
+    nz, nz_stats = noise.salt_and_pepper(im, prob, seed, return_stats=True)
+    assert nz_stats.corrupted_fraction == (nz != 128).sum()/im.size
+    assert abs(nz_stats.corrupted_fraction - prob) < 1e-2
+
+    # pepper on black pixels is counted although the values do not change
+    im = np.zeros((128, 128), dtype=np.uint8)
+    nz, nz_stats = noise.salt_and_pepper(im, prob, seed, return_stats=True)
+    assert abs(nz_stats.corrupted_fraction - prob) < 1e-2
+    assert nz_stats.corrupted_fraction > (nz != 0).sum()/im.size
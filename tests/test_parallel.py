@@ -0,0 +1,100 @@
+import os
+import multiprocessing
+import pytest
+import numpy as np
+from numpy.testing import assert_array_equal
+from concurrent.futures.process import BrokenProcessPool
+from noize import noise
+from noize import util
+from noize.parallel import Pool, sample_seeds
+from noize.stats import NoiseStats
+
+
+def _crash(image: np.ndarray) -> np.ndarray:
+    """Terminate the worker processes, the first sample is processed by the parent."""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return image
+
+
+def test_map_matches_serial():
+    seed = 25
+    rng = np.random.default_rng(0)
+    batch = rng.integers(0, 256, (5, 32, 32, 3), dtype=np.uint8)
+    seeds = sample_seeds(seed, len(batch))
+    with Pool(processes=2) as pool:
+        out = pool.map(noise.gaussian, batch, seed=seed, mean=0.0, var=0.01)
+    for i, im in enumerate(batch):
+        assert_array_equal(out[i], noise.gaussian(im, 0.0, 0.01, seeds[i]))
+
+
+def test_map_deterministic_per_sample():
+    seed = 25
+    batch = np.zeros((6, 16, 16), dtype=np.uint8)
+    with Pool(processes=2, chunksize=1) as pool:
+        out1 = pool.map(noise.salt_and_pepper, batch, seed=seed, prob=0.5)
+    with Pool(processes=3, chunksize=4) as pool:
+        out2 = pool.map(noise.salt_and_pepper, batch, seed=seed, prob=0.5)
+    assert_array_equal(out1, out2)
+    assert not np.array_equal(out1[0], out1[1])
+
+
+def test_map_return_stats():
+    seed = 25
+    batch = np.full((5, 16, 16), 128, dtype=np.uint8)
+    seeds = sample_seeds(seed, len(batch))
+    with Pool(processes=2) as pool:
+        out, batch_stats = pool.map(noise.salt_and_pepper, batch, seed=seed, prob=0.5,
+                                    return_stats=True)
+    total = NoiseStats()
+    for i, im in enumerate(batch):
+        nz, im_stats = noise.salt_and_pepper(im, 0.5, seeds[i], return_stats=True)
+        assert_array_equal(out[i], nz)
+        total.merge(im_stats)
+    assert batch_stats.images == len(batch)
+    assert batch_stats.sq_error == total.sq_error
+    assert batch_stats.corrupted == total.corrupted
+    assert (batch_stats.histogram == total.histogram).all()
+
+
+def test_map_output_shape():
+    batch = np.zeros((3, 16, 16, 3), dtype=np.uint8)
+    with Pool(processes=2) as pool:
+        out = pool.map(noise.periodic, batch, mode="gray")
+    assert out.shape == (3, 16, 16)
+
+
+def test_map_errors():
+    batch = np.zeros((3, 16, 16, 4), dtype=np.uint8)
+    with Pool(processes=2) as pool:
+        with pytest.raises(util.BadShapeException):
+            pool.map(noise.periodic, batch, mode="+")
+
+
+def _mapped_segments(pid: int) -> int:
+    with open("/proc/{}/maps".format(pid)) as f:
+        return sum("psm_" in line for line in f)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc")
+def test_segments_released():
+    batch = np.zeros((6, 64, 64, 3), dtype=np.uint8)
+    with Pool(processes=2) as pool:
+        for _ in range(3):
+            pool.map(noise.gaussian, batch, seed=25)
+        pids = list(pool._executor._processes)
+        assert pids
+        for pid in pids + [os.getpid()]:
+            assert _mapped_segments(pid) == 0
+    assert pool._executor is None
+    assert _mapped_segments(os.getpid()) == 0
+
+
+def test_worker_crash():
+    batch = np.zeros((3, 16, 16), dtype=np.uint8)
+    with Pool(processes=2) as pool:
+        with pytest.raises(BrokenProcessPool):
+            pool.map(_crash, batch)
+        # the pool is restarted after a crash
+        out = pool.map(noise.gaussian, batch, seed=25)
+    assert out.shape == batch.shape
@@ -0,0 +1,37 @@
+import json
+import numpy as np
+from noize.stats import NoiseStats, HIST_MIN
+
+
+def test_merge():
+    rng = np.random.default_rng(0)
+    clean = rng.integers(0, 256, (2, 32, 32), dtype=np.uint8)
+    noisy = rng.integers(0, 256, (2, 32, 32), dtype=np.uint8)
+    total = NoiseStats()
+    total.update(clean, noisy)
+    assert total.mse == np.mean((noisy.astype(np.float64) - clean)**2)
+    merged = NoiseStats()
+    for c, n in zip(clean, noisy):
+        im_stats = NoiseStats()
+        im_stats.update(c, n)
+        merged.merge(im_stats)
+    assert merged.pixels == total.pixels
+    assert np.isclose(merged.mse, total.mse)
+    assert (merged.histogram == total.histogram).all()
+
+
+def test_histogram_and_json():
+    clean = np.zeros((4, 4), dtype=np.uint8)
+    noisy = np.full((4, 4), 255, dtype=np.uint8)
+    noise_stats = NoiseStats()
+    noise_stats.update(clean, clean)
+    noise_stats.update(clean, noisy)
+    assert noise_stats.histogram[0 - HIST_MIN] == 16
+    assert noise_stats.histogram[255 - HIST_MIN] == 16
+    res = json.loads(noise_stats.to_json())
+    assert res["images"] == 2
+    assert res["corrupted_fraction"] is None
+
+    noise_stats = NoiseStats()
+    noise_stats.update(clean, clean)
+    assert json.loads(noise_stats.to_json())["psnr"] is None